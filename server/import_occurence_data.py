@@ -183,6 +183,16 @@ async def import_csvs_to_mongodb():
     )
 
     print("🔧 Created index on (date, scientific_name)")
+
+    # Case-insensitive index on scientific_name for the prediction pipeline, which
+    # loads a species' full history with a strength-2 collation match
+    await db.species_occurrences.create_index(
+        [("scientific_name", 1)],
+        name="scientific_name_ci_index",
+        collation={"locale": "en", "strength": 2}
+    )
+
+    print("🔧 Created case-insensitive index on scientific_name")
     print("\n🎉 All CSVs imported into MongoDB collections")
 
 if __name__ == "__main__":
@@ -13,7 +13,9 @@ prevent blocking the entire server.
 
 import re
 import os
+import time
 import logging
+from collections import OrderedDict
 from fastapi import FastAPI, HTTPException, Query
 from typing import List
 
@@ -36,8 +38,14 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # FastAPI application with static file serving for generated heatmap images
+# The directory is resolved relative to this file so it matches where make_plot.py
+# writes its cache, regardless of the working directory uvicorn was started from.
+# Cached PNGs are served straight from disk by StaticFiles (or a reverse proxy in
+# front of it) rather than being read into Python by an endpoint.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+os.makedirs(STATIC_DIR, exist_ok=True)
 app = FastAPI()
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 # MongoDB connection using async motor for non-blocking database operations
 client = AsyncIOMotorClient("mongodb://localhost:27017")
@@ -45,6 +53,37 @@ db = client.bird_tracking
 collection = db.species_occurrences
 climate_collection = db.climate
 
+# Small in-process response caches for endpoints whose data only changes when the
+# prediction ETL (a separate process) rewrites it. Nothing can invalidate them from
+# the ETL side, so entries simply expire after RESPONSE_CACHE_TTL_SECONDS, and each
+# cache keeps at most RESPONSE_CACHE_MAX_ENTRIES entries in least-recently-used order
+RESPONSE_CACHE_TTL_SECONDS = 60
+RESPONSE_CACHE_MAX_ENTRIES = 64
+forecast_cache = OrderedDict()
+species_list_cache = OrderedDict()
+
+
+def cache_get(cache, key):
+    """Return a fresh cached value for key, or None on a miss or expired entry."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at >= RESPONSE_CACHE_TTL_SECONDS:
+        cache.pop(key, None)
+        return None
+    cache.move_to_end(key)
+    return value
+
+
+def cache_put(cache, key, value):
+    """Store value under key, evicting the least recently used entry when full."""
+    cache[key] = (time.monotonic(), value)
+    cache.move_to_end(key)
+    while len(cache) > RESPONSE_CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return value
+
 # CORS middleware configured for development and production
 # Allow all origins for now - in production this should be restricted to frontend domain
 app.add_middleware(
@@ -66,9 +105,15 @@ async def get_species_list():
     because the species list changes infrequently and this approach is much faster
     for the user interface.
     """
+    cached = cache_get(species_list_cache, "species_list")
+    if cached is not None:
+        return cached
+
     species_collection = db.get_collection("species_list")
     species_list = await species_collection.find_one()
-    return species_list
+    if species_list is None:
+        return species_list
+    return cache_put(species_list_cache, "species_list", species_list)
 
 @app.get("/occurrences/{scientific_name}")
 async def get_species_occurrences(scientific_name: str):
@@ -142,13 +187,22 @@ async def get_species_forecasts(scientific_name: str):
     We sort by year and month to ensure the time series data is properly ordered
     for the forecasting chart component.
     """
+    # Keyed by the name as requested, since the response echoes it back
+    cache_key = scientific_name
+    cached = cache_get(forecast_cache, cache_key)
+    if cached is not None:
+        return cached
+
     try:
         predictions_collection = db.get_collection("bird_predictions")
         
-        # Search for exact species match (case-insensitive) to avoid confusion
-        cursor = predictions_collection.find({
-            "scientific_name": {"$regex": f"^{scientific_name}$", "$options": "i"}
-        }).sort([("year", 1), ("month", 1)])
+        # Search for exact species match (case-insensitive) to avoid confusion.
+        # A strength-2 collation match uses the case-insensitive scientific_name
+        # index, where a case-insensitive regex has to scan every key
+        cursor = predictions_collection.find(
+            {"scientific_name": scientific_name},
+            collation={"locale": "en", "strength": 2}
+        ).sort([("year", 1), ("month", 1)])
         
         forecasts = []
         async for doc in cursor:
@@ -170,11 +224,11 @@ async def get_species_forecasts(scientific_name: str):
                 detail=f"No forecasts found for {scientific_name}"
             )
         
-        return {
+        return cache_put(forecast_cache, cache_key, {
             "species": scientific_name,
             "scientific_name": scientific_name,
             "forecasts": forecasts
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -27,6 +27,25 @@ from datetime import datetime, timedelta
 from matplotlib.colors import ListedColormap, BoundaryNorm
 import matplotlib.patches as mpatches
 
+__all__ = ['generate_and_save_heatmap']
+
+# (species, year, month) keys whose background pre-generation is already running.
+# Concurrent requests for the same month would otherwise launch duplicate threads
+# that repeat the same MongoDB queries and raster renders.
+_INFLIGHT: set[tuple[str, int, int]] = set()
+_INFLIGHT_LOCK = threading.Lock()
+
+# Cache directory for generated images, served by the FastAPI /static mount
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(SCRIPT_DIR, "static")
+os.makedirs(STATIC_DIR, exist_ok=True)
+
+# Filenames known to be present in STATIC_DIR. Seeded once at import so cache hits
+# in the month pre-generation loop are a set lookup instead of a stat call per day;
+# misses still check the disk for images written by other worker processes.
+_CACHE = set(os.listdir(STATIC_DIR))
+_CACHE_LOCK = threading.Lock()
+
 def generate_and_save_heatmap(date_str: str, species: str) -> str:
     """
     Main entry point for heatmap generation with intelligent caching strategy.
@@ -46,8 +65,15 @@ def generate_and_save_heatmap(date_str: str, species: str) -> str:
     # Generate the specific requested image first for immediate response
     output_path = _generate_if_missing(date_str, species)
 
-    # Start background task to pre-generate remaining month images for smooth browsing
-    threading.Thread(target=_pre_generate_month_images, args=(date_str, species), daemon=True).start()
+    # Start background task to pre-generate remaining month images for smooth browsing,
+    # unless another request has already started one for the same species and month
+    base_date = datetime.fromisoformat(date_str)
+    key = (species, base_date.year, base_date.month)
+    with _INFLIGHT_LOCK:
+        start_worker = key not in _INFLIGHT
+        _INFLIGHT.add(key)
+    if start_worker:
+        threading.Thread(target=_pre_generate_month_images, args=(date_str, species), daemon=True).start()
 
     return output_path
 
@@ -64,22 +90,28 @@ def _generate_if_missing(date_str: str, species: str) -> str:
     bird presence and environmental temperature conditions.
     """
     # Parse date and create date range for MongoDB query (full day range)
-    DATE = datetime.strptime(date_str, "%Y-%m-%d")
+    DATE = datetime.fromisoformat(date_str)
     NEXT_DATE = DATE + timedelta(days=1)
 
     # Set up file paths for PRISM climate data and output image
-    SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
     BIL_FOLDER = os.path.join(SCRIPT_DIR, "data/PRISM")
     BIL_FILENAME = f"{date_str}.bil"
     BIL_FILE = os.path.join(BIL_FOLDER, BIL_FILENAME)
 
-    static_dir = os.path.join(SCRIPT_DIR, "static")
-    os.makedirs(static_dir, exist_ok=True)
     safe_species_name = species.replace(" ", "_")
-    output_file = os.path.join(static_dir, f"{safe_species_name}_{date_str}.png")
+    output_name = f"{safe_species_name}_{date_str}.png"
+    output_file = os.path.join(STATIC_DIR, output_name)
 
     # Check if image already exists to avoid redundant computation
+    with _CACHE_LOCK:
+        if output_name in _CACHE:
+            return output_file
+
+    # Not in this process's set: another worker process may have rendered it since
+    # startup, so check the disk once before paying for a query and a render
     if os.path.exists(output_file):
+        with _CACHE_LOCK:
+            _CACHE.add(output_name)
         return output_file
 
     # Connect to MongoDB to fetch bird observation coordinates
@@ -181,6 +213,9 @@ def _generate_if_missing(date_str: str, species: str) -> str:
     plt.savefig(output_file, dpi=300, bbox_inches='tight', pad_inches=0.05)
     plt.close()
 
+    with _CACHE_LOCK:
+        _CACHE.add(output_name)
+
     print(f"Heatmap visualization saved to {output_file}")
     return output_file
 
@@ -196,9 +231,9 @@ def _pre_generate_month_images(date_str: str, species: str):
     The function calculates the number of days in the month dynamically
     to handle varying month lengths and leap years correctly.
     """
+    base_date = datetime.fromisoformat(date_str)
+    year, month = base_date.year, base_date.month
     try:
-        base_date = datetime.strptime(date_str, "%Y-%m-%d")
-        year, month = base_date.year, base_date.month
         first_day = datetime(year, month, 1)
         
         # Calculate last day of month by finding first day of next month
@@ -210,8 +245,12 @@ def _pre_generate_month_images(date_str: str, species: str):
 
         # Generate heatmap for each day in the month
         for day in range(1, num_days + 1):
-            d = datetime(year, month, day).strftime("%Y-%m-%d")
+            d = f"{year:04d}-{month:02d}-{day:02d}"
             _generate_if_missing(d, species)
 
     except Exception as e:
-        print(f"Error during background month image generation: {e}")
\ No newline at end of file
+        print(f"Error during background month image generation: {e}")
+    finally:
+        # Release the in-flight marker so a later request can retry missing days
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.discard((species, year, month))
\ No newline at end of file
@@ -8,14 +8,18 @@ metadata, but we need clean date-based names for our heatmap generation system.
 The script keeps only the essential file types (.bil, .hdr, .prj) that are needed
 for raster processing and renames them to a YYYY-MM-DD format that matches our
 database date formatting.
+
+Run it directly to clean PRISM_FOLDER, or import clean_prism to clean another
+folder from a pipeline without starting a separate Python process.
 """
 
 import os
 import re
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Directory containing the downloaded PRISM climate data files
-folder_path = "./server/2025"
+PRISM_FOLDER = "./server/2025"
 
 # Pattern to extract the 8-digit date (YYYYMMDD) from PRISM filenames
 # PRISM files typically have names like "PRISM_tmean_stable_4kmD2_20250101_bil.bil"
@@ -23,35 +27,128 @@ pattern = re.compile(r'_(\d{8})_bil')
 
 # File extensions required for raster data processing
 # .bil = binary raster data, .hdr = header with spatial info, .prj = projection data
-allowed_extensions = {'.bil', '.hdr', '.prj'}
+allowed_extensions = frozenset(('.bil', '.hdr', '.prj'))
 
-for filename in os.listdir(folder_path):
-    ext = os.path.splitext(filename)[1].lower()
-    file_path = os.path.join(folder_path, filename)
+# Days in each month (February's leap day is checked separately)
+MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
-    if ext not in allowed_extensions:
-        # Remove auxiliary files that aren't needed for raster processing
-        # PRISM downloads often include .xml metadata and .txt files we don't use
-        try:
-            os.remove(file_path)
-            print(f"Deleted unnecessary file: {filename}")
-        except Exception as e:
-            print(f"Failed to delete {filename}: {e}")
-        continue
-
-    # Standardize naming for files we need to keep
-    match = pattern.search(filename)
-    if match:
-        date_str = match.group(1)
+# Unlink/rename are blocking syscalls that release the GIL, so a thread pool keeps
+# several in flight at once (most noticeable on network filesystems)
+MAX_WORKERS = 16
+
+
+def is_valid_date(year, month, day):
+    """Calendar check for an already-split YYYYMMDD date, without building a datetime."""
+    if not (year >= 1 and 1 <= month <= 12 and 1 <= day <= MONTH_DAYS[month - 1]):
+        return False
+    if month == 2 and day == 29:
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return True
+
+
+def apply_operation(op, dir_fd):
+    """Run one queued delete or rename and return the line to report for it, if any."""
+    if op[0] == 'delete':
+        _, filename, file_path = op
         try:
-            # Convert from YYYYMMDD to YYYY-MM-DD to match our database date format
-            # This consistency is crucial for the heatmap generation system
-            formatted_date = datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
-            new_name = f"{formatted_date}{ext}"
-            dst = os.path.join(folder_path, new_name)
-            os.rename(file_path, dst)
-            print(f"Renamed: {filename} → {new_name}")
-        except ValueError:
-            print(f"Invalid date format in filename: {filename}")
-    else:
-        print(f"Could not extract date from filename: {filename}")
+            os.unlink(file_path, dir_fd=dir_fd)
+            return f"Deleted unnecessary file: {filename}"
+        except FileNotFoundError:
+            # Already gone since the scan (e.g. removed by a concurrent run)
+            return None
+        except OSError as e:
+            return f"Failed to delete {filename}: {e}"
+
+    _, filename, file_path, new_name, dst = op
+    try:
+        os.rename(file_path, dst, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        return f"Renamed: {filename} → {new_name}"
+    except OSError as e:
+        return f"Failed to rename {filename}: {e}"
+
+
+def clean_prism(folder_path):
+    """
+    Delete non-raster files in folder_path and rename PRISM rasters to YYYY-MM-DD.<ext>.
+    """
+    # Snapshot the entries first so files renamed below aren't picked up again mid-scan
+    with os.scandir(folder_path) as it:
+        entries = list(it)
+
+    # Open the folder once and address files relative to it (unlinkat/renameat), so
+    # the kernel doesn't re-walk the folder path for every delete and rename.
+    # Platforms without dir_fd support (Windows) fall back to full paths
+    dir_fd = None
+    if os.unlink in os.supports_dir_fd and os.rename in os.supports_dir_fd:
+        dir_fd = os.open(folder_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+    # Report lines are collected and written to stdout once at the end instead of one
+    # console write per file
+    messages = []
+
+    try:
+        # Classify every file first, then run the filesystem operations in parallel
+        operations = []
+        for entry in entries:
+            # DirEntry carries the name, full path and file type from the directory
+            # read itself, so no extra join or stat is needed per file
+            if entry.is_dir(follow_symlinks=False):
+                continue
+            filename = entry.name
+            # With the folder fd, paths are just the name resolved against it
+            file_path = filename if dir_fd is not None else entry.path
+            # Extension from the last dot without splitext's tuple and stem allocation
+            # (a leading dot, as in ".hidden", is not an extension, same as splitext)
+            dot = filename.rfind('.')
+            ext = filename[dot:].lower() if dot > 0 else ''
+
+            if ext not in allowed_extensions:
+                # Remove auxiliary files that aren't needed for raster processing
+                # PRISM downloads often include .xml metadata and .txt files we don't use
+                operations.append(('delete', filename, file_path))
+                continue
+
+            # Files already renamed to YYYY-MM-DD.<ext> by an earlier run need no work
+            if dot == 10 and filename[4] == '-' and filename[7] == '-' \
+                    and (filename[:4] + filename[5:7] + filename[8:10]).isdecimal():
+                continue
+
+            # Standardize naming for files we need to keep
+            # Standard PRISM names end in "_YYYYMMDD_bil.<ext>", which plain string
+            # checks can read; anything else goes through the regex
+            date_str = None
+            idx = filename.rfind('_bil')
+            if idx >= 9 and filename[idx - 9] == '_' and filename[idx - 8:idx].isdecimal():
+                date_str = filename[idx - 8:idx]
+            else:
+                match = pattern.search(filename)
+                if match:
+                    date_str = match.group(1)
+            if date_str:
+                # Convert from YYYYMMDD to YYYY-MM-DD to match our database date format
+                # This consistency is crucial for the heatmap generation system
+                # Both parses guarantee 8 digits, so slice instead of strptime and
+                # reject impossible dates like 20250230 with an integer check
+                if is_valid_date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:])):
+                    formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+                    new_name = f"{formatted_date}{ext}"
+                    dst = new_name if dir_fd is not None else os.path.join(folder_path, new_name)
+                    operations.append(('rename', filename, file_path, new_name, dst))
+                else:
+                    messages.append(f"Invalid date format in filename: {filename}")
+            else:
+                messages.append(f"Could not extract date from filename: {filename}")
+
+        # Workers only return their messages; output stays on the main thread
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = executor.map(apply_operation, operations, [dir_fd] * len(operations))
+            messages.extend(message for message in results if message)
+    finally:
+        if messages:
+            sys.stdout.write("\n".join(messages) + "\n")
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+if __name__ == "__main__":
+    clean_prism(PRISM_FOLDER)